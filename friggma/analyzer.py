@@ -1,16 +1,231 @@
 from importlib.metadata import files
+import json
+import os
 import re
+from collections import deque
 from pathlib import Path
 from rich.console import Console
 
+# google-re2 (the `fast` extra) matches in linear time on large projects;
+# it accepts the same patterns and finditer/lastgroup API as re
+try:
+    import re2 as _re
+except ImportError:
+    _re = re
+
 console = Console()
 
+# Source file extensions the analyzers look at
+SOURCE_EXTS = ('.js', '.jsx', '.ts', '.tsx')
+COMPONENT_EXTS = ('.jsx', '.tsx')
+
+# Dependency imports, one alternative per form (bare first so it is not
+# swallowed by the lazy part of the `from` form). Anchored to statement
+# starts (a line start or a `;`, for `import a from 'a'; import 'b'`) so
+# the engine only tries real statements, and the lazy part can't run past
+# a `;` or a quote, which rules out runaway backtracking while still
+# allowing multi-line `import {\n ...\n} from` statements.
+# Match: import 'package'
+# Match: import X from 'package'
+# Match: import { X } from 'package'
+# Match: import * as X from 'package'
+_RX_IMPORTS = _re.compile(
+    r'(?m)(?:^|;)\s*import\s+[\'"](?P<bare>[^\'"]+)[\'"]'
+    r'|(?:^|;)\s*import\s+[^;\'"]*?\s+from\s+[\'"](?P<from>[^\'"]+)[\'"]'
+)
+
+# Local component imports, anchored the same way
+# Handles: import Button from "./components/ui/Button"
+# Handles: import { Button } from "./components/ui"
+# Handles: import { Button } from "./components/ui/Button"
+_RX_UI_IMPORTS = _re.compile(
+    r'(?m)(?:^|;)\s*import\s+\w+\s+from\s+[\'"]\.\/components\/ui\/(?P<default_comp>\w+)[\'"]'
+    r'|(?:^|;)\s*import\s+\{(?P<named>[^}]+)\}\s+from\s+[\'"]\.\/components\/ui(?:\/\w+)?[\'"]'
+)
+
+# First top-level statement that can't be part of the import block
+# (bytes, so the head of a file can be cut before it is decoded)
+_RX_PROLOGUE_END = _re.compile(
+    rb'(?m)^(?:export|function|const|let|var|class|interface|type|enum)\b'
+)
+
+
+def _read_head(file_path, size=8192, limit=65536):
+    """Read the start of a file up to the end of its import block"""
+    # ES imports sit at the top of the module, so there is no need to read
+    # or match the (much larger) JSX body. Raw os.open/os.read skips the
+    # buffering and extra fstat/lseek calls of read_text(), and most files
+    # never need more than the first chunk. Files without a column-0
+    # declaration (entry scripts, minified code) stop at `limit`.
+    fd = os.open(file_path, os.O_RDONLY)
+    try:
+        data = bytearray()
+        # Everything before `searched` has been checked already
+        searched = 0
+        while len(data) < limit:
+            chunk = os.read(fd, size)
+            if not chunk:
+                break
+            data += chunk
+            
+            # Only complete lines, so `\b` never fires at a chunk boundary
+            end = data.rfind(b'\n', searched) + 1
+            if end:
+                match = _RX_PROLOGUE_END.search(data, searched, end)
+                if match:
+                    return bytes(data[:match.start()])
+                searched = end
+        
+        match = _RX_PROLOGUE_END.search(data, searched)
+        return bytes(data[:match.start()] if match else data)
+    finally:
+        os.close(fd)
+
+
+def _iter_sources(directory, exts=SOURCE_EXTS):
+    """Yield files in directory with a matching extension (non-recursive)"""
+    # One scandir pass instead of a glob per extension; is_file() is
+    # answered from the dirent without an extra stat on most platforms
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.name.endswith(exts) and entry.is_file():
+                    yield Path(entry.path)
+    except FileNotFoundError:
+        return
+
+
+def _scan_imports(file_path):
+    """Extract all import specifiers from a file (None if it can't be read)"""
+    imports = []
+    
+    try:
+        data = _read_head(file_path)
+        
+        # Plain substring check on the raw bytes first; utility and
+        # style-only files never get decoded or run through the pattern
+        if b'import' in data:
+            content = data.decode('utf-8', 'replace')
+            for match in _RX_IMPORTS.finditer(content):
+                imports.append(match.group(match.lastgroup))
+                
+    except Exception as e:
+        console.print(f"[yellow]Warning: Could not read {file_path}: {e}[/yellow]")
+        return None
+    
+    return imports
+
+
+def _scan_components(file_path):
+    """Extract the local ui component names a file imports (None if it can't be read)"""
+    components = set()
+    
+    try:
+        data = _read_head(file_path)
+        
+        # Every pattern alternative contains this literal
+        if b'./components/ui' in data:
+            content = data.decode('utf-8', 'replace')
+            for match in _RX_UI_IMPORTS.finditer(content):
+                if match.lastgroup == 'default_comp':
+                    components.add(match.group('default_comp'))
+                else:
+                    for imp in match.group('named').split(','):
+                        comp_name = imp.strip().split(' as ')[0].strip()
+                        components.add(comp_name)
+                
+    except Exception as e:
+        console.print(f"[yellow]Warning: Could not scan {file_path}: {e}[/yellow]")
+        return None
+    
+    return components
+
+
+class ScanCache:
+    """
+    On-disk cache of per-file scan results, kept between runs
+    
+    An entry is reused while its file's (mtime_ns, size) is unchanged.
+    """
+    
+    # Bump whenever the patterns or the stored layout change
+    VERSION = 1
+    
+    def __init__(self, path):
+        self.path = Path(path)
+        self._stored = self._load()
+        # Only files looked up this run are written back
+        self._entries = {}
+    
+    def get(self, kind, file_path, scan):
+        """
+        Return scan(file_path) as a list, reusing the stored result if unchanged
+        
+        A failed scan (None) is passed through and never stored, so it is
+        retried next run rather than remembered as "no imports".
+        """
+        key = str(file_path)
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            # Let the scan report it
+            return self._as_list(scan(file_path))
+        
+        stamp = [st.st_mtime_ns, st.st_size]
+        entry = self._stored.get(kind, {}).get(key)
+        if self._is_valid(entry) and entry[:2] == stamp:
+            result = entry[2]
+        else:
+            result = self._as_list(scan(file_path))
+            if result is None:
+                return None
+        
+        self._entries.setdefault(kind, {})[key] = [*stamp, result]
+        return result
+    
+    def save(self):
+        """Write this run's entries to the cache file"""
+        data = {'version': self.VERSION, 'scans': self._entries}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps(data))
+        except OSError as e:
+            console.print(f"[yellow]Warning: Could not write {self.path}: {e}[/yellow]")
+    
+    def _load(self):
+        """Read a previous run's cache; a missing, stale or malformed one is empty"""
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return {}
+        
+        if not isinstance(data, dict) or data.get('version') != self.VERSION:
+            return {}
+        scans = data.get('scans')
+        if not isinstance(scans, dict):
+            return {}
+        return {kind: entries for kind, entries in scans.items() if isinstance(entries, dict)}
+    
+    @staticmethod
+    def _as_list(result):
+        """Store-ready copy of a scan result, keeping None for a failed scan"""
+        return None if result is None else list(result)
+    
+    @staticmethod
+    def _is_valid(entry):
+        """Check a stored entry has the [mtime_ns, size, [names...]] shape"""
+        return (
+            isinstance(entry, list) and len(entry) == 3
+            and isinstance(entry[2], list)
+            and all(isinstance(name, str) for name in entry[2])
+        )
+
 
 class DependencyAnalyzer:
     """Analyzes import statements to find required dependencies"""
     
     # Known Figma UI components (these come from Figma Make)
-    FIGMA_UI_COMPONENTS = {
+    FIGMA_UI_COMPONENTS = frozenset({
     "accordion", "alert-dialog", "alert", "aspect-ratio",
     "avatar", "badge", "breadcrumb", "button",
     "calendar", "card", "carousel", "chart",
@@ -23,11 +238,12 @@ class DependencyAnalyzer:
     "skeleton", "slider", "sonner", "switch",
     "table", "tabs", "textarea", "toggle-group",
     "toggle", "tooltip", "use-mobile", "utils",
-    }
+    })
     
-    def __init__(self, src_path):
+    def __init__(self, src_path, cache=None):
         self._src_path = Path(src_path)
         self.src_path = self._src_path / 'app' / 'components' 
+        self.cache = cache
         
     def analyze(self):
         """
@@ -42,15 +258,14 @@ class DependencyAnalyzer:
         figma_components = set()
         
         # Find all JS/TS files
-        files = list(self.src_path.glob('*.js')) + \
-                list(self.src_path.glob('*.jsx')) + \
-                list(self.src_path.glob('*.ts')) + \
-                list(self.src_path.glob('*.tsx'))
+        files = list(_iter_sources(self.src_path))
         
         for file in files:
             imports = self._extract_imports(file)
             
             for imp in imports:
+                # Cheap prefix check first; only relative/absolute paths
+                # go on to the Figma component match
                 if self._is_npm_package(imp):
                     # Skip react and react-dom (already in Vite template)
                     if imp not in ['react', 'react-dom', 'react/jsx-runtime']:
@@ -65,137 +280,123 @@ class DependencyAnalyzer:
     
     def _extract_imports(self, file_path):
         """Extract all import statements from a file"""
-        imports = []
-        
-        try:
-            content = file_path.read_text()
-            
-            # Match: import X from 'package'
-            # Match: import { X } from 'package'
-            # Match: import * as X from 'package'
-            patterns = [
-                r'import\s+.*?\s+from\s+[\'"]([^\'"]+)[\'"]',
-                r'import\s+[\'"]([^\'"]+)[\'"]',
-            ]
-            
-            for pattern in patterns:
-                matches = re.finditer(pattern, content)
-                for match in matches:
-                    imports.append(match.group(1))
-                    
-        except Exception as e:
-            console.print(f"[yellow]Warning: Could not read {file_path}: {e}[/yellow]")
-        
-        return imports
+        if self.cache is None:
+            imports = _scan_imports(file_path)
+        else:
+            imports = self.cache.get('imports', file_path, _scan_imports)
+        # Unreadable files were already reported
+        return imports if imports is not None else []
     
     def _is_npm_package(self, import_path):
         """Check if import is an npm package (not relative/absolute)"""
         # npm packages don't start with . or /
-        return not import_path.startswith('.') and not import_path.startswith('/')
+        return not import_path.startswith(('.', '/'))
     
     def _is_figma_component(self, import_path):
         """Check if import path includes a known Figma UI component"""
         # Check if any Figma component name is in the path
-        return any(comp in import_path for comp in self.FIGMA_UI_COMPONENTS)
+        return bool(_RX_FIGMA.search(import_path))
+
+
+# All Figma component names in one pattern, so a path is scanned once
+# instead of once per name. Longest first so e.g. toggle-group wins
+# over toggle.
+_RX_FIGMA = _re.compile('(?:' + '|'.join(sorted(
+    map(re.escape, DependencyAnalyzer.FIGMA_UI_COMPONENTS), key=len, reverse=True
+)) + ')')
 
 
 class ComponentAnalyzer:
     """Analyzes React components to find and remove unused ones"""
     
-    def __init__(self, project_dir):
+    def __init__(self, project_dir, cache=None):
         self.project_dir = Path(project_dir)
+        self.cache = cache
+        self._scan_failed = False
         self.src_dir = self.project_dir / 'src' / 'app'
         self.components_dir = self.src_dir / 'components' / 'ui'
+        self._comp_index = None
         
     def remove_unused(self):
         """Find and delete unused components"""
         if not self.components_dir.exists():
             return 0
         
-        # Find all component files
-        component_files = list(self.components_dir.glob('*.jsx')) + \
-                         list(self.components_dir.glob('*.tsx'))
+        # Find all component files (reused for lookups during the scan)
+        if self._comp_index is None:
+            self._comp_index = self._build_comp_index()
         
-        if not component_files:
+        if not self._comp_index:
             return 0
         
         # Find which are used
         used_components = self._find_used_components()
         
+        # An unreadable file could import anything, deleting based on a
+        # partial picture would strip components that are in use
+        if self._scan_failed:
+            console.print("[yellow]Warning: Some files could not be scanned, keeping all components[/yellow]")
+            return 0
+        
         # Delete unused
         removed = 0
-        for comp_file in component_files:
-            comp_name = comp_file.stem
+        for comp_name, comp_file in self._comp_index.items():
             if comp_name not in used_components:
-                comp_file.unlink()
+                comp_file.unlink(missing_ok=True)
                 removed += 1
         
+        # Deleted files are still in the index, rebuild on next use
+        self._comp_index = None
+        
         return removed
     
     def _find_used_components(self):
         """Find all components that are imported"""
-        used = set()
+        # `seen` is both the visited guard and the result; a name is only
+        # queued the first time it shows up, so each one is scanned once
+        seen = set()
+        to_check = deque()
+        self._scan_failed = False
         
-        # Scan entry files (everything in src root)
-        entry_files = list(self.src_dir.glob('*.jsx')) + \
-                     list(self.src_dir.glob('*.tsx')) + \
-                     list(self.src_dir.glob('*.js')) + \
-                     list(self.src_dir.glob('*.ts'))
+        def push(comps):
+            if comps is None:
+                self._scan_failed = True
+                return
+            for comp in comps:
+                if comp not in seen:
+                    seen.add(comp)
+                    to_check.append(comp)
         
-        for file in entry_files:
-            self._scan_imports(file, used)
+        # Scan entry files (everything in src root)
+        for file in _iter_sources(self.src_dir):
+            push(self._component_imports(file))
         
         # Recursively check components importing other components
-        checked = set()
-        to_check = list(used)
-        
         while to_check:
-            comp = to_check.pop(0)
-            if comp in checked:
-                continue
-            checked.add(comp)
-            
-            comp_file = self._find_component_file(comp)
+            comp_file = self._find_component_file(to_check.popleft())
             if comp_file:
-                new_imports = set()
-                self._scan_imports(comp_file, new_imports)
-                for new_comp in new_imports:
-                    if new_comp not in used:
-                        used.add(new_comp)
-                        to_check.append(new_comp)
+                push(self._component_imports(comp_file))
         
-        return used
+        return seen
     
-    def _scan_imports(self, file_path, used_set):
-        """Scan file for component imports"""
-        try:
-            content = file_path.read_text()
-            
-            # Match different import patterns for local components
-            patterns = [
-                # Handles: import Button from "./components/ui/Button"
-                r'import\s+(\w+)\s+from\s+[\'"]\.\/components\/ui\/(\w+)[\'"]',
-                # Handles: import { Button } from "./components/ui"
-                r'import\s+\{([^}]+)\}\s+from\s+[\'"]\.\/components\/ui[\'"]',
-                # Handles: import { Button } from "./components/ui/Button"
-                r'import\s+\{([^}]+)\}\s+from\s+[\'"]\.\/components\/ui\/\w+[\'"]'
-            ]
-            
-            for pattern in patterns:
-                matches = re.finditer(pattern, content)
-                for match in matches:
-                    if len(match.groups()) == 2:
-                        used_set.add(match.group(2))
-                    else:
-                        imports = match.group(1).split(',')
-                        for imp in imports:
-                            comp_name = imp.strip().split(' as ')[0].strip()
-                            used_set.add(comp_name)
-        except Exception as e:
-            console.print(f"[yellow]Warning: Could not scan {file_path}: {e}[/yellow]")
+    def _component_imports(self, file_path):
+        """Return the ui component names a file imports, None if it can't be read"""
+        if self.cache is None:
+            return _scan_components(file_path)
+        components = self.cache.get('components', file_path, _scan_components)
+        return set(components) if components is not None else None
+    
+    def _build_comp_index(self):
+        """Map component name -> file for everything in the ui folder"""
+        # Figma Make's ui folder is flat, so one scandir replaces an
+        # rglob over the whole tree for every name we look up
+        return {
+            comp_file.stem: comp_file
+            for comp_file in _iter_sources(self.components_dir, COMPONENT_EXTS)
+        }
     
     def _find_component_file(self, comp_name):
         """Find component file by name"""
-        possible_files = list(self.components_dir.rglob(f'{comp_name}.jsx')) + \
-                        list(self.components_dir.rglob(f'{comp_name}.tsx'))
-        return possible_files[0] if possible_files else None
\ No newline at end of file
+        if self._comp_index is None:
+            self._comp_index = self._build_comp_index()
+        return self._comp_index.get(comp_name)
@@ -1,4 +1,3 @@
-import os
 import click
 from rich.console import Console
 from rich.prompt import Confirm
@@ -6,8 +5,16 @@ from pathlib import Path
 import subprocess
 import shutil
 import json
+import re
+import sys
+import errno
 
-from .analyzer import DependencyAnalyzer
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from .analyzer import DependencyAnalyzer, ScanCache
 
 console = Console()
 
@@ -39,14 +46,25 @@ def init(src_folder, output, keep_unused):
         console.print(f"[green]Creating folder: {output_path.name}...[/green]")
         output_path.mkdir(parents=True, exist_ok=True)
     else:
+        # The copied src folder gets replaced below, so it can't be the input
+        if src_path == output_path / 'src' or (output_path / 'src') in src_path.parents:
+            raise click.UsageError("SRC_FOLDER can't be inside the output folder's src")
         # If it exists ask to overwrite
         if not Confirm.ask(f"[yellow]Folder '{output_path.name}' already exists. Overwrite contents?[/yellow]"):
             raise click.Abort()
+        # Overwriting replaces the copied folders outright so nothing from a
+        # previous src lingers; templates are rewritten below and
+        # node_modules is left for npm to reuse
+        for folder in ('src', 'public'):
+            shutil.rmtree(output_path / folder, ignore_errors=True)
 
     try:
         # Analyze dependencies
         console.print("[blue]Analyzing dependencies...[/blue]")
-        analyzer = DependencyAnalyzer(src_path)
+        # Scan results from earlier runs into this folder; lives under
+        # node_modules so it never ends up in the user's project files
+        cache = ScanCache(output_path / 'node_modules' / '.cache' / 'friggma' / 'scans.json')
+        analyzer = DependencyAnalyzer(src_path, cache)
         deps = analyzer.analyze()
         
         console.print(f"Found {len(deps['npm_packages'])} npm packages")
@@ -66,17 +84,20 @@ def init(src_folder, output, keep_unused):
             'index.html'
         ]
 
+        # Collect the status lines and print them in one go
+        added = []
         for file in temp_files:
             src = template_dir / file
             dst = output_path / file
-            shutil.copy(src, dst)
-            console.print(f"✓ Added {file}", style="green")
+            _fast_copy(src, dst)
+            added.append(f"✓ Added {file}")
+        console.print("\n".join(added), style="green")
 
-        shutil.copytree(template_dir / 'public' , output_path / 'public')
+        shutil.copytree(template_dir / 'public' , output_path / 'public', copy_function=_fast_copy)
         console.print("✓ Added public directory", style="green")
         
         # Copy user's src folder
-        shutil.copytree(src_path, output_path / 'src')
+        shutil.copytree(src_path, output_path / 'src', copy_function=_fast_copy)
         shutil.copy(template_dir / 'main.tsx', output_path / 'src' / 'main.tsx')
         console.print("✓ Copied src folder and added entry point main.tsx", style="green")
 
@@ -84,30 +105,44 @@ def init(src_folder, output, keep_unused):
         shutil.copy(template_dir / 'fonts.css', output_path / 'src' / 'styles' / 'fonts.css')
         console.print("✓ Added fonts.css", style="green")
         
-        # Initialize npm 
-        with console.status("[bold green]Running npm install..."):
-            _install_npm(output_path)
-        console.print("✓ Project initialized", style="green")
-
-        # Install Tailwind v4
-        with console.status("[bold green]Installing Tailwind CSS v4..."):
-            _install_tailwind(output_path)
-        console.print("✓ Tailwind CSS v4 installed", style="green")
-        
-        # Install detected dependencies
-        if deps['npm_packages']:
-            with console.status(f"[bold green]Installing {len(deps['npm_packages'])} dependencies..."):
-                _install_dependencies(output_path, deps['npm_packages'])
-            console.print(f"✓ Installed: {', '.join(deps['npm_packages'])}", style="green")
+        # Install template deps, Tailwind v4 and detected dependencies in a
+        # single npm run (package.json is copied from the template, so no
+        # separate bare install is needed). It runs in the background while
+        # we prune components, since npm is mostly waiting on the network.
+        packages = _installable_packages(deps['npm_packages'])
+        install = _install_dependencies(output_path, packages)
         
         # Remove unused components (optional)
+        removed = 0
         if not keep_unused:
             from .analyzer import ComponentAnalyzer
-            analyzer = ComponentAnalyzer(output_path)
-            with console.status("[bold green]Removing unused components..."):
+            analyzer = ComponentAnalyzer(output_path, cache)
+            try:
                 removed = analyzer.remove_unused()
-            if removed > 0:
-                console.print(f"✓ Removed {removed} unused components", style="green")
+            except Exception:
+                install.kill()
+                install.wait()
+                raise
+        
+        skipped = []
+        with console.status("[bold green]Installing Tailwind CSS v4 and dependencies..."):
+            installed = _wait_for_install(install)
+            # npm fails the whole run on a single bad spec, so retry with
+            # just the defaults to still get a working base project
+            if not installed and packages:
+                console.print("[yellow]Install failed, retrying without the detected packages...[/yellow]")
+                skipped = [pkg for pkg in packages if pkg not in DEFAULT_PACKAGES]
+                packages = []
+                installed = _wait_for_install(_install_dependencies(output_path, packages))
+        cache.save()
+        if removed > 0:
+            console.print(f"✓ Removed {removed} unused components", style="green")
+        if not installed:
+            raise click.ClickException("npm install failed. Run 'npm install' manually in the folder.")
+        if skipped:
+            console.print(f"[yellow]Could not install: {', '.join(skipped)}. Add them manually with npm install.[/yellow]")
+        if packages:
+            console.print(f"✓ Installed: {', '.join(packages)}", style="green")
         
         # If success
         console.print(f"\n[bold pink]✓ Project ready at: {output_path}[/bold pink]\n")
@@ -115,6 +150,9 @@ def init(src_folder, output, keep_unused):
         console.print(f"  cd {output}")
         console.print(f"  npm run dev\n")
         
+    except click.ClickException:
+        # Already carries a user-facing message and a non-zero exit code
+        raise
     except Exception as e:
         console.print(f"[bold red]Error: {str(e)}[/bold red]")
         import traceback
@@ -122,48 +160,97 @@ def init(src_folder, output, keep_unused):
         raise click.Abort()
 
 
-def _install_npm(output_path):
-    # Install base dependencies
-    subprocess.run(
-        ['npm', 'install'],
-        cwd=output_path,
-        check=True,
-        capture_output=True
-    )
+# Linux ioctl that clones a file's extents copy-on-write (btrfs, xfs, ...)
+_FICLONE = 0x40049409
+# Errors meaning cloning isn't possible here (ext4, tmpfs, across filesystems)
+_CLONE_UNSUPPORTED = {errno.EOPNOTSUPP, errno.EXDEV, errno.EINVAL, errno.ENOTTY, errno.ENOSYS}
+# Cleared after the first unsupported error, so e.g. ext4 only pays for one
+# failed attempt before every copy goes straight to copy2
+_try_clone = fcntl is not None and sys.platform.startswith('linux')
 
 
-def _install_tailwind(output_path):
-    """Install Tailwind CSS v4"""
-    subprocess.run(
-        ['npm', 'install', 'tailwindcss', '@tailwindcss/vite', "tw-animate-css"],
-        cwd=output_path,
-        check=True,
-        capture_output=True
-    )
+def _fast_copy(src, dst):
+    """Copy a file, cloning it copy-on-write when the filesystem supports it"""
+    # Not hardlinks: npm and editors rewrite files in place, which would
+    # then also change the packaged templates or the user's src folder
+    global _try_clone
+    if _try_clone:
+        try:
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+            shutil.copystat(src, dst)
+            return dst
+        except OSError as e:
+            if e.errno in _CLONE_UNSUPPORTED:
+                _try_clone = False
+    return shutil.copy2(src, dst)
+
+
+# Always installed: Tailwind v4, 'motion' (the bridge) and 'tw-animate-css' (the fix)
+DEFAULT_PACKAGES = [
+    "tailwindcss", "@tailwindcss/vite", "tw-animate-css",
+    "lucide-react", "framer-motion", "motion",
+]
 
 
 def _install_dependencies(output_path, packages):
+    """Start npm install for the default and detected packages"""
     # Just combine everything into one list
-    # We include 'motion' (the bridge) and 'tw-animate-css' (the fix) by default
-    all_deps = ["lucide-react", "framer-motion", "motion"]
+    all_deps = list(DEFAULT_PACKAGES)
     
     # Add any extra packages found by your scanner, avoiding duplicates
     if packages:
-        all_deps = list(set(all_deps + packages))
+        all_deps = list(dict.fromkeys(all_deps + packages))
+    
+    # Don't re-request what the template package.json already declares;
+    # npm installs those anyway and would otherwise resolve them twice
+    with open(output_path / 'package.json') as f:
+        manifest = json.load(f)
+    existing = set(manifest.get('dependencies', {})) | set(manifest.get('devDependencies', {}))
+    # Compare without a pinned version: 'react@19.0.0' is still react
+    to_install = [dep for dep in all_deps if dep[:1] + dep[1:].split('@')[0] not in existing]
 
-    pkg_string = " ".join(all_deps)
+    # Started, not awaited: see _wait_for_install
+    # Arg list rather than a shell string, so package names are never
+    # interpreted by a shell. which() resolves npm.cmd on Windows.
+    # With nothing extra to add this is still needed as the bare install.
+    return subprocess.Popen(
+        [shutil.which('npm') or 'npm', 'install', *to_install, '--no-fund', '--no-audit'],
+        cwd=str(output_path)
+    )
 
-    try:
-        subprocess.run(
-            f"npm install {pkg_string} --no-fund --no-audit",
-            cwd=str(output_path),
-            shell=True,
-            check=True,
-            env=os.environ.copy()
-        )
-        console.print("[green]✓ UI Engine Ready.[/green]")
-    except subprocess.CalledProcessError:
-        console.print("[red] Install failed. Run 'npm install' manually in the folder.[/red]")
+
+# A valid npm package name, optionally scoped and pinned as Figma Make
+# likes to do: react, @radix-ui/react-slot, sonner@2.0.3
+_RX_NPM_NAME = re.compile(
+    r'^(?:@[a-z0-9][\w.~-]*/)?[a-z0-9][\w.~-]*(?:@[\w.~^*-]+)?$', re.IGNORECASE
+)
+
+
+def _installable_packages(import_paths):
+    """Turn detected import specifiers into npm package names worth installing"""
+    # Imports can point into a package ('motion/react'), npm wants the name.
+    # Bundler-only specifiers ('figma:asset/x.png', the '@/lib' alias) aren't
+    # packages at all and would make npm reject the whole install.
+    names = (_package_name(path) for path in import_paths)
+    return list(dict.fromkeys(name for name in names if _RX_NPM_NAME.match(name)))
+
+
+def _package_name(import_path):
+    """Strip a subpath import down to its npm package name"""
+    parts = import_path.split('/')
+    # Scoped packages keep their scope: @radix-ui/react-slot
+    if import_path.startswith('@'):
+        return '/'.join(parts[:2])
+    return parts[0]
+
+
+def _wait_for_install(process):
+    """Wait for a running npm install; returns True if it succeeded"""
+    if process.wait() != 0:
+        return False
+    console.print("[green]✓ UI Engine Ready.[/green]")
+    return True
 
 if __name__ == '__main__':
     main()